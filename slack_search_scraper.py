@@ -1,24 +1,256 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
 import os
+import sys
 import json
 import asyncio
+import atexit
 from datetime import datetime
-from playwright.async_api import async_playwright, Page, TimeoutError
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict
 import argparse
 import re
 import time
+import math
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-from rich import print as rprint
-from tqdm import tqdm
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 import html2text
 
+# Playwright takes a while to import, so it's only imported inside the functions that use it
+# (run() first, so a missing install shows up before anything else); --help and argument
+# errors don't wait for it
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+# orjson is optional; it makes JSON export considerably faster when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# uvloop is optional too (not available on Windows); it gives a faster event loop for all the browser traffic
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Initialize rich console
 console = Console()
 
+# Worker processes for the html2text conversion, started by run(); None converts in this process
+_html_pool = None
+
+# html2text converter, configured once; each pool process has its own copy of the module
+_H2T = html2text.HTML2Text()
+_H2T.body_width = 0  # Don't wrap lines
+_H2T.unicode_snob = True  # Use Unicode characters
+_H2T.ul_item_mark = "*"  # Use * for unordered lists
+_H2T.ignore_links = True  # Don't show URLs for links
+_H2T.protect_links = True  # Don't wrap links in <>
+_H2T.single_line_break = True  # Use single line breaks
+
+# Refresh the saved authentication state once it is older than this (seconds)
+AUTH_REFRESH_AGE = 24 * 60 * 60
+
+# How many queries are searched at the same time when several are given
+MAX_PARALLEL_QUERIES = 3
+
+# Selectors used throughout the scraper
+SEARCH_BUTTON_SELECTOR = '[data-qa="top_nav_search"]'
+SEARCH_RESULT_SELECTOR = '.c-search_message__content'
+PAGE_BUTTON_SELECTOR = '[data-qa="c-pagination_page_btn_{}"]'
+SORT_BUTTON_SELECTOR = 'button.p-search_filter__trigger_button'
+COUNT_SELECTOR = (
+    '[data-qa="search_result_header"] [data-qa="search_result_count"], '
+    '[data-qa="search_result_count"], '
+    '.p-search_results__count'
+)
+
+# Chromium switches for headless runs: skip the services and features a scraper never uses
+HEADLESS_CHROMIUM_ARGS = [
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-translate',
+    '--mute-audio',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-features=TranslateUI'
+]
+
+# Request interception turns off Chromium's HTTP cache, so a persistent profile (whose point is
+# that cache) doesn't route requests and just has the browser skip images instead
+NO_IMAGES_CHROMIUM_ARG = '--blink-settings=imagesEnabled=false'
+
+# Request types that don't carry any message data (stylesheets stay, the results need their layout)
+BLOCKED_RESOURCE_TYPES = frozenset(('image', 'font', 'media'))
+
+# Precompiled patterns for the number in the result count text and runs of blank lines
+_COUNT_RE = re.compile(r'\d+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+# Analytics and tracking beacons, blocked along with the resource types above
+_BLOCKED_URL_RE = re.compile(r'/beacon|/analytics|/clog/track|slackb\.com')
+
+# Character substitutions applied to every message in a single pass: emoji back to Slack
+# format and underscores to asterisks for consistency
+_TEXT_TRANSLATION = str.maketrans({'☝': ':point_up:', '☺': ':relaxed:', '_': '*'})
+
+# Registered on every context as an init script so the scanner is parsed once per document.
+# window.__penguinExtract(group) reads a single message group. window.__penguinInstall()
+# starts a MutationObserver that scans the rendered message groups whenever the DOM changes
+# and queues the ones we haven't seen yet, so Python only has to drain the queue with
+# window.__penguinDrain(), which also reports whether the list is scrolled to the bottom.
+# Installing returns the number of results the list reports through its ARIA attributes, if any.
+# Truncated messages get their "Show more" button clicked and are left out of the queue
+# until the expanded content is in place (or we give up waiting on it).
+MESSAGE_SCANNER_INIT_JS = """(() => {
+    const expanding = new Map();
+    // One compound query covers every place the "Show more" button has turned up
+    const showMoreSelector = 'button, [data-qa="message-preview-show-more-button"]';
+    const findShowMore = (el) => {
+        for (const button of el.querySelectorAll(showMoreSelector)) {
+            if ((button.textContent || '').includes('Show more')) return button;
+        }
+        return null;
+    };
+
+    // Read one message group: null without a timestamp, {complete: false} when it isn't a
+    // readable message, {pending: true} while a truncated message is being expanded
+    window.__penguinExtract = (group) => {
+        // Only timestamp links that carry data-ts can identify a message
+        const ts = group.querySelector('a.c-timestamp[data-ts]')?.getAttribute('data-ts');
+        if (!ts) return null;
+
+        // The message element lives inside the actions container
+        const message = group.querySelector('.c-message_kit__actions .c-search_message');
+        const timestamp = message?.querySelector('.c-search_message__content a.c-timestamp[data-ts]');
+        const sender = message?.querySelector('.c-search_message__content button.c-message__sender_button');
+        if (!message || !timestamp || !sender) return {key: ts, complete: false};
+
+        // Expand truncated messages before reading them
+        const showMore = findShowMore(message);
+        if (showMore) {
+            if (!expanding.has(ts)) {
+                expanding.set(ts, Date.now());
+                showMore.click();
+                return {key: ts, pending: true, expanding: true};
+            }
+            // Read it as it is if the button hasn't gone away in time; keep this well under
+            // scroll_for_messages' 2s idle limit at the bottom of the list
+            if (Date.now() - expanding.get(ts) < 1000) return {key: ts, pending: true};
+        }
+
+        const channelName = group.querySelector('.c-channel_entity__name');
+        const href = timestamp.getAttribute('href') || '';
+        const archive = href.match(/\\/archives\\/([^/]+)\\//);
+        return {
+            key: ts,
+            timestamp: timestamp.getAttribute('data-ts'),
+            sender: sender.textContent,
+            blocks: Array.from(message.querySelectorAll('.c-message__message_blocks > div'), (b) => b.outerHTML),
+            channel: channelName ? channelName.textContent : (archive ? archive[1] : null),
+            complete: true
+        };
+    };
+
+    window.__penguinScan = () => {
+        const seen = window.__penguinSeen;
+        const queue = window.__penguinQueue;
+        for (const group of document.querySelectorAll('.c-message_group--ia4')) {
+            const ts = group.querySelector('a.c-timestamp[data-ts]')?.getAttribute('data-ts');
+            if (!ts || seen.has(ts)) continue;
+
+            const message = window.__penguinExtract(group);
+            if (!message) continue;
+            if (message.pending) {
+                // Report the expansion once, then wait for the full message
+                if (message.expanding) queue.push(message);
+                continue;
+            }
+            seen.add(ts);
+            queue.push(message);
+        }
+    };
+
+    // How many results the list says it holds (its a11y row count or set size), if it tells us
+    const resultCount = () => {
+        const result = document.querySelector('.c-search_message__content');
+        const count = parseInt(
+            result?.closest('[aria-rowcount]')?.getAttribute('aria-rowcount') ||
+            result?.closest('[aria-setsize]')?.getAttribute('aria-setsize'), 10);
+        return count > 0 ? count : null;
+    };
+
+    window.__penguinInstall = () => {
+        window.__penguinQueue = [];
+        window.__penguinSeen = new Set();
+        if (!window.__penguinObserver) {
+            window.__penguinObserver = new MutationObserver(() => window.__penguinScan());
+            window.__penguinObserver.observe(document.body, {childList: true, subtree: true});
+        }
+        return resultCount();
+    };
+
+    // Whether the list holding the results is scrolled all the way down
+    const scrollContainer = (el) => {
+        for (let node = el?.parentElement; node; node = node.parentElement) {
+            if (/(auto|scroll)/.test(getComputedStyle(node).overflowY) && node.scrollHeight > node.clientHeight) return node;
+        }
+        return document.scrollingElement;
+    };
+    const atBottom = () => {
+        const container = scrollContainer(document.querySelector('.c-message_group--ia4'));
+        return !!container && container.scrollTop + container.clientHeight >= container.scrollHeight - 2;
+    };
+
+    // Hand over everything the observer queued (scanning once more in case nothing mutated)
+    window.__penguinDrain = () => {
+        window.__penguinScan();
+        const queued = window.__penguinQueue;
+        window.__penguinQueue = [];
+        return {messages: queued, atBottom: atBottom()};
+    };
+})();"""
+
+# DOM structure dump of the first search result, printed with --debug to help fix selectors
+DEBUG_STRUCTURE_JS = """() => {
+    // Get a sample message to understand structure
+    const firstMsg = document.querySelector('.c-search_message__content');
+    const structure = firstMsg ? {
+        parentClasses: firstMsg.parentElement?.className || 'no parent',
+        grandparentClasses: firstMsg.parentElement?.parentElement?.className || 'no grandparent',
+        timeElement: {
+            exists: !!firstMsg.closest('.c-search_message--light')?.querySelector('time'),
+            classes: firstMsg.closest('.c-search_message--light')?.querySelector('time')?.className || 'no time element',
+            attributes: Array.from(firstMsg.closest('.c-search_message--light')?.querySelector('time')?.attributes || [])
+                .map(attr => `${attr.name}="${attr.value}"`)
+                .join(', ') || 'no attributes'
+        },
+        senderElement: {
+            exists: !!firstMsg.closest('.c-search_message--light')?.querySelector('.c-message__sender_button'),
+            classes: firstMsg.closest('.c-search_message--light')?.querySelector('.c-message__sender_button')?.className || 'no sender element'
+        },
+        textElement: {
+            exists: !!firstMsg.querySelector('.p-rich_text_section'),
+            classes: firstMsg.querySelector('.p-rich_text_section')?.className || 'no text element',
+            text: firstMsg.querySelector('.p-rich_text_section')?.textContent.trim() || 'no text'
+        }
+    } : 'No message found';
+
+    return {
+        structure,
+        html: firstMsg?.parentElement?.outerHTML || 'no HTML'
+    };
+}"""
+
 PENGUIN_BANNER = """
 🐧 Penguin - Slack Search Scraper 🐧
 -----------------------------------
@@ -26,28 +258,54 @@ PENGUIN_BANNER = """
      with grace and precision!
 """
 
-import os
-import json
-import asyncio
-from datetime import datetime
-from playwright.async_api import async_playwright, Page
-from typing import List, Dict
-import argparse
-import re
-import time
+async def _block_heavy_resources(route):
+    """Skip downloads the scraper never looks at (avatars, emoji images, fonts, media, telemetry)."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _BLOCKED_URL_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def prepare_scraper_context(context, block_resources: bool = True):
+    """Preload the message scanner into every page of the context and skip heavy downloads."""
+    await context.add_init_script(MESSAGE_SCANNER_INIT_JS)
+    if block_resources:
+        await context.route("**/*", _block_heavy_resources)
+    return context
+
+async def new_scraper_context(browser, storage_state=None):
+    """Create a browser context with the message scanner preloaded into every page."""
+    return await prepare_scraper_context(await browser.new_context(storage_state=storage_state))
+
+def load_auth_state(auth_file: str):
+    """Load saved authentication state, or None if there is none (or it can't be read)."""
+    try:
+        with open(auth_file, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
 
 async def login_to_slack(page: Page, workspace_url: str, auth_file: str = "slack_auth.json") -> bool:
     """Log into Slack workspace."""
+    from playwright.async_api import TimeoutError
     try:
         console.print("[cyan]🌐 Navigating to workspace...[/cyan]")
-        await page.goto(workspace_url)
+        await page.goto(workspace_url, wait_until='domcontentloaded')
         
-        try:
-            await page.wait_for_selector('[data-qa="top_nav_search"]', timeout=5000)
-            console.print("[green]• Already logged in![/green]")
-            return True
-        except:
-            console.print("[yellow]🔑 Need to log in...[/yellow]")
+        # Slack redirects to a sign-in page when we aren't logged in, so only probe for the
+        # search button when we actually landed in the client. Landing there means we're most
+        # likely logged in, so give a slow workspace boot plenty of time before deciding otherwise
+        if '/client' in page.url:
+            try:
+                await page.wait_for_selector(SEARCH_BUTTON_SELECTOR, timeout=15000)
+                console.print("[green]• Already logged in![/green]")
+                # Keep the saved state fresh so the next run can reuse the session too
+                if not os.path.exists(auth_file) or time.time() - os.path.getmtime(auth_file) > AUTH_REFRESH_AGE:
+                    await page.context.storage_state(path=auth_file)
+                return True
+            except TimeoutError:
+                pass
+        console.print("[yellow]🔑 Need to log in...[/yellow]")
         
         console.print(Panel.fit(
             "[bold yellow]Please log in through your browser[/bold yellow]\n"
@@ -59,9 +317,13 @@ async def login_to_slack(page: Page, workspace_url: str, auth_file: str = "slack
             await page.wait_for_url("**/client/*", timeout=120000)
             
             console.print("[green]• Logged in! Waiting for workspace to load...[/green]")
-            await page.wait_for_selector('[data-qa="top_nav_search"]', timeout=120000)
+            await page.wait_for_selector(SEARCH_BUTTON_SELECTOR, timeout=120000)
             
-            await page.wait_for_timeout(10000)
+            # Let the workspace finish its initial requests before saving state
+            try:
+                await page.wait_for_load_state('networkidle', timeout=10000)
+            except TimeoutError:
+                pass  # Slack keeps some connections busy, the state is good enough
             
             console.print(f"[blue]💾 Saving authentication state to {auth_file}[/blue]")
             await page.context.storage_state(path=auth_file)
@@ -78,55 +340,48 @@ async def login_to_slack(page: Page, workspace_url: str, auth_file: str = "slack
 
 async def navigate_to_search(page: Page, search_query: str):
     """Navigate to search results page."""
+    from playwright.async_api import TimeoutError
     try:
-        # Wait for the workspace to fully load
-        search_button = await page.wait_for_selector('[data-qa="top_nav_search"]', timeout=120000)
+        # Click the search box (the locator waits for the workspace to load)
+        await page.locator(SEARCH_BUTTON_SELECTOR).click(timeout=120000)
         
-        if not search_button:
-            raise Exception("Could not find search button")
-            
-        # Click the search box
-        await search_button.click()
-        await page.wait_for_timeout(2000)
+        # Wait for the search input to take focus instead of sleeping
+        await page.wait_for_function(
+            "() => { const el = document.activeElement; return !!el && (el.isContentEditable || el.tagName === 'INPUT'); }",
+            timeout=5000
+        )
         
         # Type the search query
         await page.keyboard.type(search_query)
-        await page.wait_for_timeout(1000)
         await page.keyboard.press('Enter')
         
         console.print("[green]🔍 Waiting for results to load...[/green]")
-        await page.wait_for_selector('.c-search_message__content', timeout=120000)
+        await page.wait_for_selector(SEARCH_RESULT_SELECTOR, timeout=120000)
 
         # Ensure sort order is set to Oldest
         try:
-            # Find the sort button by class and child span text
-            sort_button = await page.query_selector('//button[contains(@class, "p-search_filter__trigger_button") and .//span[contains(text(), "Sort:")]]')
-            if sort_button:
-                sort_text = await sort_button.text_content()
-                if sort_text and "Oldest" in sort_text:
+            # Find the sort button by class and text (a CSS + text locator rather than a document XPath)
+            sort_button = page.locator(SORT_BUTTON_SELECTOR, has_text='Sort:').first
+            try:
+                sort_text = await sort_button.text_content(timeout=2000)
+            except TimeoutError:
+                sort_text = None
+                console.print("[yellow]⚠️ Could not find sort button with 'Sort:' text[/yellow]")
+            if sort_text is not None:
+                if "Oldest" in sort_text:
                     console.print("[cyan]Sort order already set to Oldest[/cyan]")
                 else:
                     await sort_button.click()
-                    await page.wait_for_timeout(500)
-                    # Find the dropdown option by visible text (robust to overlays/portals)
-                    # Playwright text selector: 'text=Oldest', but ensure it's visible
+                    # Prefer the menu item by role; fall back to any visible 'Oldest' text (robust to
+                    # overlays/portals). The locator waits for the menu to open.
+                    oldest_option = page.get_by_role('menuitem', name='Oldest').or_(page.locator('text=Oldest >> visible=true'))
                     try:
-                        await page.wait_for_selector('text=Oldest', timeout=3000, state='visible')
-                        oldest_options = await page.query_selector_all('text=Oldest')
-                        clicked = False
-                        for option in oldest_options:
-                            # Only click if visible
-                            if await option.is_visible():
-                                await option.click()
-                                console.print("[cyan]🔃 Set sort order to Oldest[/cyan]")
-                                clicked = True
-                                break
-                        if not clicked:
-                            console.print("[yellow]⚠️ Could not find a visible/clickable 'Oldest' sort option[/yellow]")
+                        await oldest_option.first.click(timeout=3000)
+                        console.print("[cyan]🔃 Set sort order to Oldest[/cyan]")
+                    except TimeoutError:
+                        console.print("[yellow]⚠️ Could not find a visible/clickable 'Oldest' sort option[/yellow]")
                     except Exception as e:
                         console.print(f"[yellow]⚠️ Error waiting for or clicking 'Oldest': {e}[/yellow]")
-            else:
-                console.print("[yellow]⚠️ Could not find sort button with 'Sort:' text[/yellow]")
         except Exception as sort_err:
             console.print(f"[yellow]⚠️ Error setting sort order: {sort_err}[/yellow]")
 
@@ -136,247 +391,178 @@ async def navigate_to_search(page: Page, search_query: str):
         console.print(f"[red]❌ Error during search: {str(e)}[/red]")
         return False
 
-async def scroll_for_messages(page, exporter, progress=None, task_id=None):
-    """Scan for messages while gently scrolling."""
-    processed_timestamps = set()
-    expected_messages = 20
-    no_new_messages_count = 0
-    max_attempts_without_messages = 100  # With 100ms delay, this is 10 seconds
+# Viewport size per page; it doesn't change while we scrape, so it's looked up only once
+# (weak keys, so closed worker and query pages don't stay alive for the whole run)
+_viewports: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+async def center_mouse(page: Page) -> Dict:
+    """Move the mouse to the middle of the viewport for scrolling and return the viewport size."""
+    viewport = _viewports.get(page)
+    if viewport is None:
+        viewport = page.viewport_size or await page.evaluate("() => ({width: window.innerWidth, height: window.innerHeight})")
+        _viewports[page] = viewport
+    # Clicking a page button moves the mouse onto the pagination, so move it back every time
+    await page.mouse.move(viewport['width']/2, viewport['height']/2)
+    return viewport
+
+async def scroll_for_messages(page, exporter=None, progress=None, task_id=None, verbose: bool = False) -> List[Dict]:
+    """Scan for messages while gently scrolling. Returns them, writing each to the exporter if given."""
+    from playwright.async_api import TimeoutError
+    # The page keeps the set of seen timestamps, so everything drained is new; just count it
+    scanned_count = 0
+    messages = []
+    expected_messages = 20  # Results per page
+    idle_since = None  # When we last stopped finding new messages
+    max_idle_without_messages = 10.0  # Seconds
+    max_idle_at_bottom = 2.0  # Seconds, once we can't scroll any further
+    # Wait for new messages briefly while they keep coming, longer (up to 400ms) while they don't
+    min_wait = 20
+    max_wait = 400
+    wait_ms = min_wait
+    last_progress_update = 0.0
+    # Scroll in big steps while messages keep coming, smaller ones near the end of the list
+    max_scroll_delta = 400
+    min_scroll_delta = 100
+    scroll_delta = max_scroll_delta
     
     try:
-        # Move mouse to middle of viewport for scrolling
-        viewport_height = await page.evaluate('window.innerHeight')
-        viewport_width = await page.evaluate('window.innerWidth')
-        await page.mouse.move(viewport_width/2, viewport_height/2)
+        # Mouse wheel scrolling needs the mouse over the results
+        await center_mouse(page)
+        
+        # Start collecting messages in the page as they render. When the list reports how many
+        # results it holds (e.g. a short last page) we can stop as soon as we have them all.
+        result_count = await page.evaluate("() => window.__penguinInstall()")
+        if result_count:
+            expected_messages = min(expected_messages, result_count)
         
-        while len(processed_timestamps) < expected_messages:
-            prev_count = len(processed_timestamps)
+        while scanned_count < expected_messages:
+            prev_count = scanned_count
+            
+            # Drain the messages the observer found since the last tick
+            drained = await page.evaluate("() => window.__penguinDrain()")
+            ready = []
+            expanding = 0
+            for raw_message in drained['messages']:
+                if raw_message.get('pending'):
+                    expanding += bool(raw_message.get('expanding'))
+                    continue
+                ready.append(raw_message)
+            scanned_count += len(ready)
             
-            # Scan for messages
-            groups = await page.query_selector_all('.c-message_group--ia4')
-            for group in groups:
-                timestamp_elem = await group.query_selector('a.c-timestamp')
-                if timestamp_elem:
-                    timestamp = await timestamp_elem.get_attribute('data-ts')
-                    if timestamp and timestamp not in processed_timestamps:
-                        processed_timestamps.add(timestamp)
-                        # Extract and write message immediately
-                        message_info = await extract_message_info(page, group)  
-                        if message_info:
-                            exporter.write_message(message_info)
-                            if progress and task_id is not None:
-                                progress.update(task_id, completed=len(processed_timestamps))
+            if expanding and verbose:
+                console.print(f"[blue]🔍 Found and expanding {expanding} truncated message(s)[/blue]")
             
-            # Check if we found any new messages
-            if len(processed_timestamps) == prev_count:
-                no_new_messages_count += 1
-                if no_new_messages_count >= max_attempts_without_messages:
+            batch = await build_messages(ready, verbose)
+            
+            # Write the whole tick's batch in one go
+            messages.extend(batch)
+            if exporter:
+                for message_info in batch:
+                    await exporter.put(message_info)
+            
+            # Refresh the progress bar at most twice a second
+            if progress and task_id is not None and time.monotonic() - last_progress_update >= 0.5:
+                progress.update(task_id, completed=scanned_count)
+                last_progress_update = time.monotonic()
+            
+            # Check if we found any new messages; back off the scroll distance while nothing shows up
+            if scanned_count == prev_count:
+                if idle_since is None:
+                    idle_since = time.monotonic()
+                scroll_delta = max(min_scroll_delta, scroll_delta // 2)
+                wait_ms = min(max_wait, wait_ms * 2)
+                # Once the list can't scroll any further, only give lazy loading a short grace period
+                max_idle = max_idle_at_bottom if drained['atBottom'] else max_idle_without_messages
+                if time.monotonic() - idle_since >= max_idle:
                     break
             else:
-                no_new_messages_count = 0
+                idle_since = None
+                scroll_delta = min(max_scroll_delta, scroll_delta * 2)
+                wait_ms = min_wait
+            if expanding:
+                # A message was just sent expanding and only shows up once that's done (at most 1s);
+                # don't let the idle limit end the page before it does
+                idle_since = None
             
-            # Gentle scroll using mouse wheel
-            await page.mouse.wheel(0, 50)  # Small delta for gentle scrolling
-            await page.wait_for_timeout(100)  # Brief pause to let content load
+            # Scroll using mouse wheel
+            await page.mouse.wheel(0, scroll_delta)
+            try:
+                # Continue as soon as the observer queues something new, backing off while it doesn't
+                await page.wait_for_function("() => window.__penguinQueue.length > 0", timeout=wait_ms)
+            except TimeoutError:
+                pass  # Nothing new yet, keep scrolling
             
     except KeyboardInterrupt:
         console.print("\n[yellow]🛑 Stopped by user[/yellow]")
-        return len(processed_timestamps)
+        return messages
     except Exception as e:
         console.print(f"[red]❌ Error during scan: {str(e)}[/red]")
-        return len(processed_timestamps)
+        return messages
     
-    return len(processed_timestamps)
+    return messages
 
 async def navigate_to_next_page(page: Page, next_page_num: int) -> bool:
     """Navigate to the next page of results using the numbered page buttons. Returns True if successful."""
     try:
         # Build selector for the next page button
-        selector = f'[data-qa="c-pagination_page_btn_{next_page_num}"]'
+        selector = PAGE_BUTTON_SELECTOR.format(next_page_num)
         next_button = await page.query_selector(selector)
         
         if not next_button:
             console.print(f"[yellow]🛑 No page button found for page {next_page_num}[/yellow]")
             return False
         
-        # Check if it's disabled
-        is_disabled = await next_button.get_attribute('disabled') or await next_button.get_attribute('aria-disabled')
+        # In one round trip: check if it's disabled, and remember the first result so we can
+        # tell when the page has changed
+        button_state = await next_button.evaluate("""(b) => ({
+            disabled: b.getAttribute('disabled') || b.getAttribute('aria-disabled'),
+            firstTs: document.querySelector('a.c-timestamp[data-ts]')?.getAttribute('data-ts') || null
+        })""")
+        is_disabled = button_state['disabled']
         if is_disabled and is_disabled != 'false':
             console.print(f"[yellow]🛑 Page button {next_page_num} is disabled[/yellow]")
             return False
+        first_ts = button_state['firstTs']
         
         console.print(f"[cyan]🔄 Moving to page {next_page_num}...[/cyan]")
         await next_button.click()
         
-        # Wait for new results to load
-        await page.wait_for_selector('.c-search_message__content', timeout=120000)
-        await page.wait_for_timeout(2000)  # Extra wait for stability
+        # Wait for new results to replace the old ones
+        await page.wait_for_load_state('domcontentloaded')
+        await page.wait_for_function(
+            "ts => { const first = document.querySelector('a.c-timestamp[data-ts]'); return !!first && first.getAttribute('data-ts') !== ts; }",
+            arg=first_ts,
+            timeout=120000
+        )
+        await page.locator(SEARCH_RESULT_SELECTOR).first.wait_for(timeout=120000)
         
         return True
     except Exception as e:
         console.print(f"[red]❌ Error navigating to page {next_page_num}: {str(e)}[/red]")
         return False
 
-async def extract_messages_from_page(page: Page):
-    """Extract messages from the current page of search results."""
+async def dump_dom_structure(page: Page):
+    """Print the structure of the first search result (for --debug, when selectors need fixing)."""
     try:
-        # Wait for any loading to finish
-        await wait_for_results_load(page)
-        
-        console.print("[cyan]🔄 Processing page...[/cyan]")
-        
-        # Scroll to load all messages
-        messages = await scroll_for_messages(page, None)
-        
-        # First get debug info about the page structure
-        debug_info = await page.evaluate('''() => {
-            // Get a sample message to understand structure
-            const firstMsg = document.querySelector('.c-search_message__content');
-            const structure = firstMsg ? {
-                parentClasses: firstMsg.parentElement?.className || 'no parent',
-                grandparentClasses: firstMsg.parentElement?.parentElement?.className || 'no grandparent',
-                timeElement: {
-                    exists: !!firstMsg.closest('.c-search_message--light')?.querySelector('time'),
-                    classes: firstMsg.closest('.c-search_message--light')?.querySelector('time')?.className || 'no time element',
-                    attributes: Array.from(firstMsg.closest('.c-search_message--light')?.querySelector('time')?.attributes || [])
-                        .map(attr => `${attr.name}="${attr.value}"`)
-                        .join(', ') || 'no attributes'
-                },
-                senderElement: {
-                    exists: !!firstMsg.closest('.c-search_message--light')?.querySelector('.c-message__sender_button'),
-                    classes: firstMsg.closest('.c-search_message--light')?.querySelector('.c-message__sender_button')?.className || 'no sender element'
-                },
-                textElement: {
-                    exists: !!firstMsg.querySelector('.p-rich_text_section'),
-                    classes: firstMsg.querySelector('.p-rich_text_section')?.className || 'no text element',
-                    text: firstMsg.querySelector('.p-rich_text_section')?.textContent.trim() || 'no text'
-                }
-            } : 'No message found';
-            
-            return {
-                structure,
-                html: firstMsg?.parentElement?.outerHTML || 'no HTML'
-            };
-        }''')
-        
+        debug_info = await page.evaluate(DEBUG_STRUCTURE_JS)
         console.print("\n[cyan]🔍 DOM Structure Analysis:[/cyan]")
         console.print(json.dumps(debug_info, indent=2))
-        
-        # Now extract messages
-        messages_info = await page.evaluate('''() => {
-            const messages = [];
-            const messageElements = document.querySelectorAll('.c-search_message__content');
-            console.log(`Found ${messageElements.length} message elements`);
-            
-            for (const msgElement of messageElements) {
-                try {
-                    // Get the parent message container
-                    const parentMessage = msgElement.closest('.c-search_message--light');
-                    if (!parentMessage) {
-                        console.log('Skipping - no parent message found');
-                        continue;
-                    }
-                    
-                    // Get timestamp from the time element
-                    const timeElement = parentMessage.querySelector('time');
-                    let ts = null;
-                    if (timeElement) {
-                        // Try different timestamp attributes
-                        ts = timeElement.getAttribute('data-ts');
-                        const datetime = timeElement.getAttribute('datetime');
-                        console.log('Timestamp info:', {
-                            dataTs: ts,
-                            datetime: datetime,
-                            elementClasses: timeElement.className,
-                            parentClasses: timeElement.parentElement?.className
-                        });
-                        
-                        if (!ts && datetime) {
-                            // Convert ISO datetime to Unix timestamp
-                            try {
-                                ts = (new Date(datetime).getTime() / 1000).toString();
-                                console.log('Converted datetime to timestamp:', ts);
-                            } catch (e) {
-                                console.log('Failed to convert datetime:', e.message);
-                            }
-                        }
-                    } else {
-                        console.log('No time element found');
-                    }
-                    
-                    // Get sender name
-                    const senderElement = parentMessage.querySelector('.c-message__sender_button');
-                    const sender = senderElement ? senderElement.textContent.trim() : 'Unknown';
-                    console.log('Sender:', sender);
-                    
-                    // Get message text from rich text sections
-                    const textElements = msgElement.querySelectorAll('.p-rich_text_section');
-                    console.log(`Found ${textElements.length} text elements`);
-                    let text = '';
-                    for (const el of textElements) {
-                        text += (text ? ' ' : '') + el.textContent.trim();
-                    }
-                    console.log('Message text:', text.substring(0, 100));
-                    
-                    // Only add if we have both timestamp and text
-                    if (ts && text) {
-                        messages.push({
-                            sender: sender,
-                            timestamp: ts,
-                            text: text
-                        });
-                        console.log('Added message:', {
-                            sender: sender,
-                            timestamp: ts,
-                            textPreview: text.substring(0, 50)
-                        });
-                    } else {
-                        console.log('Skipping message - missing required fields:', {
-                            hasTimestamp: !!ts,
-                            timestampValue: ts,
-                            hasText: !!text,
-                            textLength: text.length
-                        });
-                    }
-                } catch (e) {
-                    console.error('Error processing message:', e.message);
-                }
-            }
-            
-            console.log(`Successfully extracted ${messages.length} messages`);
-            return messages;
-        }''')
-        
-        console.print(f"\n[cyan]📊 Found {len(messages_info)} messages on this page[/cyan]")
-        return messages_info
-        
     except Exception as e:
-        console.print(f"[red]❌ Error extracting messages: {str(e)}[/red]")
-        import traceback
-        traceback.print_exc()
-        return []
+        console.print(f"[red]❌ Error analyzing DOM structure: {str(e)}[/red]")
 
 async def get_total_results_count(page: Page) -> int:
     """Get the total number of search results."""
+    from playwright.async_api import TimeoutError
     try:
-        # Try different selectors for the count
-        count_selectors = [
-            '[data-qa="search_result_header"] [data-qa="search_result_count"]',
-            '[data-qa="search_result_count"]',
-            '.p-search_results__count'
-        ]
-        
-        for selector in count_selectors:
-            try:
-                count_element = await page.wait_for_selector(selector, timeout=5000)
-                if count_element:
-                    count_text = await count_element.text_content()
-                    # Try to extract the number from text like "X results" or "X matches"
-                    import re
-                    if match := re.search(r'\d+', count_text):
-                        return int(match.group())
-            except:
-                continue
+        # Any of these may hold the count; one combined selector matches whichever exists
+        try:
+            count_text = await page.locator(COUNT_SELECTOR).first.text_content(timeout=2000)
+        except TimeoutError:
+            return 0
+        
+        # Try to extract the number from text like "X results" or "1,234 matches"
+        if count_text and (match := _COUNT_RE.search(count_text.replace(',', ''))):
+            return int(match.group())
         
         return 0
         
@@ -384,259 +570,333 @@ async def get_total_results_count(page: Page) -> int:
         console.print(f"[red]❌ Error getting total count: {str(e)}[/red]")
         return 0
 
-async def extract_message_info(page, message_group):
-    """Extract message information from a message group element."""
+def start_html_pool(workers: int):
+    """Start the html2text worker processes, one per scraping worker (at least two)."""
+    global _html_pool
+    if _html_pool:
+        _html_pool.shutdown(wait=False)
+    _html_pool = ProcessPoolExecutor(max_workers=max(2, workers))
+
+def blocks_to_markdown(blocks: List[str]) -> List[str]:
+    """Convert the block HTML of one message to markdown parts, or None if html2text chokes on it."""
     try:
-        # Find the message element within the group - it's inside the actions container
-        message_element = await message_group.query_selector('.c-message_kit__actions .c-search_message')
-        if not message_element:
-            return None
-            
-        # Get timestamp from the link element with class c-timestamp
-        timestamp_element = await message_element.query_selector('.c-search_message__content a.c-timestamp')
-        if not timestamp_element:
-            return None
-            
-        # Get the data-ts attribute which contains the Unix timestamp
-        timestamp = await timestamp_element.get_attribute('data-ts')
-        if not timestamp:
-            return None
-            
-        # Get sender from button with class c-message__sender_button
-        sender_element = await message_element.query_selector('.c-search_message__content button.c-message__sender_button')
-        if not sender_element:
-            return None
-        sender = await sender_element.text_content()
-        
-        # Check for and click "Show more" button if present
-        try:
-            # Look specifically for buttons containing "Show more" text
-            show_more_selectors = [
-                'button:has-text("Show more")',
-                'button.c-link--button:has-text("Show more")',
-                '[data-qa="message-preview-show-more-button"]',
-                'button[aria-label*="Show more"]'
-            ]
-            
-            for selector in show_more_selectors:
-                show_more = await message_element.query_selector(selector)
-                if show_more:
-                    button_text = await show_more.text_content()
-                    if "Show more" in button_text:
-                        if args.verbose:
-                            console.print("[blue]🔍 Found and expanding truncated message[/blue]")
-                        
-                        # Click and wait for content update
-                        await show_more.click()
-                        await page.wait_for_timeout(1000)
-                        
-                        # Wait for any loading spinners to disappear
-                        try:
-                            await page.wait_for_selector('.c-loading_spinner', state='hidden', timeout=2000)
-                        except:
-                            pass  # No spinner found, that's okay
-                        
-                        break  # Exit loop if we found and clicked a button
-                    
-        except Exception as e:
-            if "Element is not attached to the DOM" in str(e):
-                # This is expected sometimes when the page updates during scanning
-                if args.verbose:
-                    console.print("[yellow]⚠️  Message content changed during processing - this is normal[/yellow]")
-            else:
-                # Show other click errors as warnings since they might indicate an issue
-                console.print(f"[yellow]⚠️  Could not expand message: {str(e)}[/yellow]")
-        
-        # Get text content from all message blocks, handling different formats
-        text_parts = []
-        
-        # Get all message blocks
-        blocks = await message_element.query_selector_all('.c-message__message_blocks > div')
-        
-        if args.verbose:
-            console.print(f"[blue]Found {len(blocks)} message blocks[/blue]")
-        
-        for block in blocks:
-            if args.verbose:
-                html = await block.evaluate('(element) => element.outerHTML')
-                console.print(f"[yellow]Block HTML:[/yellow]\n{html}")
-            
-            # Get the HTML content
-            html = await block.evaluate('(element) => element.outerHTML')
-            
-            # Configure html2text
-            h = html2text.HTML2Text()
-            h.body_width = 0  # Don't wrap lines
-            h.unicode_snob = True  # Use Unicode characters
-            h.ul_item_mark = "*"  # Use * for unordered lists
-            h.ignore_links = True  # Don't show URLs for links
-            h.protect_links = True  # Don't wrap links in <>
-            h.single_line_break = True  # Use single line breaks
-            
-            # Convert HTML to markdown
-            text = h.handle(html)
-            
-            if text and text.strip():
-                text_parts.append(text.strip())
+        # Convert HTML to markdown, dropping empty blocks
+        return [text.strip() for text in map(_H2T.handle, blocks) if text.strip()]
+    except Exception:
+        return None
 
-        # Join all parts with appropriate spacing
-        text = '\n'.join(text_parts)
+def html_to_markdown(messages_blocks: List[List[str]]) -> List[List[str]]:
+    """Convert the block HTML of a batch of messages to markdown parts (runs in the html pool)."""
+    return [blocks_to_markdown(blocks) for blocks in messages_blocks]
 
-        # Clean up the text
-        text = text.replace('\n\n\n', '\n\n')  # Remove extra blank lines
-        text = re.sub(r'\n\s*\n', '\n\n', text)  # Normalize multiple blank lines
-        text = text.replace('☝', ':point_up:')  # Convert emoji back to Slack format
-        text = text.replace('☺', ':relaxed:')
-        text = text.replace('_', '*')  # Convert underscores to asterisks for consistency
-        
-        if args.verbose:
-            console.print(f"[blue]📏 Message length: {len(text)} characters[/blue]")
-            console.print(f"[green]Message parts: {len(text_parts)}[/green]")
-            console.print("[cyan]Message parts:[/cyan]")
-            for part in text_parts:
-                console.print(f"[cyan]- {part}[/cyan]")
-        
-        # Get channel name from the message group header
-        channel_element = await message_group.query_selector('.c-channel_entity__name')
-        channel = None
-        if channel_element:
-            channel = await channel_element.text_content()
-        else:
-            # Fallback to extracting from timestamp URL if header not found
-            href = await timestamp_element.get_attribute('href')
-            if href:
-                match = re.search(r'/archives/([^/]+)/', href)
-                if match:
-                    channel = match.group(1)
+def format_message_text(text_parts: List[str], verbose: bool = False) -> str:
+    """Clean up the converted blocks of a message into its text."""
+    # Join all parts with appropriate spacing
+    text = '\n'.join(text_parts)
+
+    # Clean up the text
+    text = _BLANK_LINES_RE.sub('\n\n', text)  # Normalize multiple blank lines
+    text = text.translate(_TEXT_TRANSLATION)  # Emoji back to Slack format, underscores to asterisks
+    
+    if verbose:
+        console.print(f"[blue]📏 Message length: {len(text)} characters[/blue]")
+        console.print(f"[green]Message parts: {len(text_parts)}[/green]")
+        console.print("[cyan]Message parts:[/cyan]")
+        for part in text_parts:
+            console.print(f"[cyan]- {part}[/cyan]")
+    
+    return text
 
+def build_message_info(raw_message: Dict, text_parts: List[str], verbose: bool = False) -> Dict:
+    """Build message information from a message scanned in the browser and its converted blocks."""
+    try:
         return {
-            'timestamp': float(timestamp),
-            'sender': sender,
-            'text': text,
-            'channel': channel
+            'timestamp': float(raw_message['timestamp']),
+            'sender': raw_message['sender'],
+            'text': format_message_text(text_parts, verbose),
+            'channel': raw_message['channel']
         }
     except Exception as e:
-        if args.verbose:
+        if verbose:
             console.print(f"[blue]❌ Error extracting message info: {str(e)}[/blue]")
         return None
 
-async def process_message(page, message_group, exporter):
-    """Process a single message."""
-    try:
-        # Extract message info using our helper function
-        message_info = await extract_message_info(page, message_group)  
+async def build_messages(raw_messages: List[Dict], verbose: bool = False) -> List[Dict]:
+    """Build message information for a batch of scanned messages, converting their HTML in the pool."""
+    complete = [raw_message for raw_message in raw_messages if raw_message.get('complete')]
+    if not complete:
+        return []
+    
+    if verbose:
+        for raw_message in complete:
+            console.print(f"[blue]Found {len(raw_message['blocks'])} message blocks[/blue]")
+            for html in raw_message['blocks']:
+                console.print(f"[yellow]Block HTML:[/yellow]\n{html}")
+    
+    # html2text is pure Python; run it in another process so the event loop keeps talking to the browser
+    global _html_pool
+    messages_blocks = [raw_message['blocks'] for raw_message in complete]
+    converted = None
+    if _html_pool:
+        try:
+            converted = await asyncio.get_running_loop().run_in_executor(_html_pool, html_to_markdown, messages_blocks)
+        except BrokenProcessPool:
+            # A worker process died; keep going without the pool rather than dropping every batch from now on
+            console.print("[yellow]⚠️  HTML conversion pool stopped; converting in the main process from now on[/yellow]")
+            _html_pool = None
+    if converted is None:
+        converted = html_to_markdown(messages_blocks)
+    
+    messages = []
+    for raw_message, text_parts in zip(complete, converted):
+        if text_parts is None:
+            if verbose:
+                console.print(f"[blue]❌ Could not convert a message from {raw_message.get('sender')}[/blue]")
+            continue
+        message_info = build_message_info(raw_message, text_parts, verbose)
         if message_info:
-            exporter.write_message(message_info)
-            
-    except Exception as e:
-        if args.verbose:
-            console.print(f"[blue]❌ Error processing message: {e}[/blue]")
+            messages.append(message_info)
+    return messages
 
-async def process_messages(page: Page, exporter: 'SlackSearchExport') -> int:
-    """Process messages from the current page."""
-    messages_found = 0
+def page_ranges(pages: List[int]) -> str:
+    """Format page numbers compactly, e.g. [2, 3, 4, 7] -> '2-4, 7'."""
+    ranges = []
+    for page_num in sorted(pages):
+        if ranges and ranges[-1][1] == page_num - 1:
+            ranges[-1][1] = page_num
+        else:
+            ranges.append([page_num, page_num])
+    return ', '.join(str(first) if first == last else f'{first}-{last}' for first, last in ranges)
+
+def print_summary(pages_processed: int, total_messages: int, start_time: float, exporter: 'SlackSearchExport', missing_pages: List[int] = ()):
+    """Print the end-of-run statistics panel."""
+    elapsed_time = time.time() - start_time
+    if missing_pages:
+        headline = f"[yellow]⚠️ Search incomplete - pages not scraped: {page_ranges(missing_pages)}[/yellow]\n"
+    else:
+        headline = "[green]📬 Search Complete![/green]\n"
+    console.print(Panel.fit(
+        headline +
+        f"[cyan]📊 Statistics:[/cyan]\n"
+        f"   • Pages processed: {pages_processed}\n"
+        f"   • Messages found: {total_messages}\n"
+        f"   • Time taken: {elapsed_time:.1f} seconds\n"
+        f"   • Messages per second: {total_messages/elapsed_time:.1f}\n"
+        f"[blue]📁 Output saved to: {exporter.filename}[/blue]",
+        title="🐧 Summary",
+        border_style="yellow" if missing_pages else "cyan"
+    ))
+
+async def open_search_page(browser, storage_state: Dict, workspace_url: str, query: str, shared_context=None):
+    """Open a new context with the given auth state and run the search in it.
+    
+    Returns what to close when done (the context, or just the page when sharing a context) and the page."""
+    if shared_context:
+        # A persistent context can't have sibling contexts; search in another page of it instead
+        owner = await shared_context.new_page()
+    else:
+        owner = await new_scraper_context(browser, storage_state)
     try:
-        message_groups = await page.query_selector_all('[data-qa="virtual-list-item"]')
-        
-        if not message_groups:
-            return 0
-        
-        valid_messages = []
-        for message_group in message_groups:
-            try:
-                message_info = await extract_message_info(page, message_group)
-                if message_info:
-                    valid_messages.append((message_group, message_info))
-            except Exception as e:
-                # Skip silently - these are usually just non-message elements
-                continue
-        
-        if not valid_messages:
-            return 0
+        page = owner if shared_context else await owner.new_page()
+        await page.goto(workspace_url, wait_until='domcontentloaded')
+        if await navigate_to_search(page, query):
+            return owner, page
+    except Exception:
+        await owner.close()
+        raise
+    await owner.close()
+    return None, None
+
+def lower_last_page(state: Dict, page_num: int):
+    """Results end at `page_num`, but never cut off a page another worker has already scraped."""
+    state['last_page'] = min(state['last_page'], max(page_num, max(state['scraped'], default=0)))
+
+def give_up_pages(state: Dict, first_page: int, stride: int):
+    """Record a worker's remaining pages (from `first_page` on) as not scraped so the others aren't held up."""
+    state['failed'].update(range(first_page, state['last_page'] + 1, stride))
+
+async def write_ready_pages(state: Dict, exporter: 'SlackSearchExport'):
+    """Write out every page whose predecessors are all done, keeping the output in order."""
+    while state['next_page'] <= state['last_page']:
+        page_num = state['next_page']
+        if page_num in state['pages']:
+            for message in state['pages'].pop(page_num):
+                await exporter.put(message)
+                state['total_messages'] += 1
+            state['pages_written'] += 1
+            await exporter.flush()
+        elif page_num not in state['failed']:
+            break
+        state['next_page'] += 1
+
+async def scrape_page_stride(page: Page, first_page: int, stride: int, state: Dict, exporter: 'SlackSearchExport'):
+    """Scrape every `stride`-th page starting at `first_page`, stepping over the pages in between."""
+    page_num = 1
+    while page_num <= state['last_page']:
+        if page_num >= first_page and (page_num - first_page) % stride == 0:
+            if state['debug']:
+                await dump_dom_structure(page)
             
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console
-        ) as progress:
-            task = progress.add_task("[cyan]Processing messages...", total=len(valid_messages))
+            if stride == 1 and state['live_progress']:
+                # Alone on the results: show live progress and write messages as they are found
+                console.print(f"\n[cyan]📄 Processing page {page_num}...[/cyan]")
+                progress = state['progress']
+                task = progress.add_task("", total=20)  # Expected messages per page
+                messages_found = len(await scroll_for_messages(page, exporter, progress, task, verbose=state['verbose']))
+                progress.remove_task(task)
+                state['pages'][page_num] = []
+                state['total_messages'] += messages_found
+            elif stride == 1:
+                # Other searches share the console, so no live display; still write as we go
+                messages_found = len(await scroll_for_messages(page, exporter, verbose=state['verbose']))
+                console.print(f"[cyan]📄 {state['query']} - page {page_num}: {messages_found} messages[/cyan]")
+                state['pages'][page_num] = []
+                state['total_messages'] += messages_found
+            else:
+                # Keep the page in memory so pages can be written out in order
+                messages = await scroll_for_messages(page, verbose=state['verbose'])
+                messages_found = len(messages)
+                console.print(f"[cyan]📄 Page {page_num}: {messages_found} messages[/cyan]")
+                state['pages'][page_num] = messages
+            state['scraped'].add(page_num)
             
-            for _, message_info in valid_messages:
-                try:
-                    messages_found += 1
-                    exporter.write_message(message_info)
-                    progress.update(task, advance=1)
-                except Exception as e:
-                    if args.verbose:
-                        console.print(f"[blue]⚠️  Failed to save message: {str(e)}[/blue]")
-                    continue
-                    
-        return messages_found
+            if messages_found == 0:
+                lower_last_page(state, page_num)
+            
+            await write_ready_pages(state, exporter)
+            
+            if messages_found == 0:
+                return
         
-    except Exception as e:
-        if args.verbose:
-            console.print(f"[blue]❌ Error processing messages: {str(e)}[/blue]")
-        return messages_found
+        # This worker's next own page (page_num may be one it is only stepping through): jump straight
+        # there when its button is shown, otherwise step through
+        if page_num < first_page:
+            target_page = first_page
+        else:
+            target_page = first_page + ((page_num - first_page) // stride + 1) * stride
+        if target_page > state['last_page']:
+            return
+        next_page_num = page_num + 1
+        if next_page_num < target_page and await page.locator(PAGE_BUTTON_SELECTOR.format(target_page)).count():
+            next_page_num = target_page
+        
+        if not await page.locator(PAGE_BUTTON_SELECTOR.format(next_page_num)).count():
+            # No button for the next page: the results really end here
+            console.print(f"[yellow]🛑 No page button found for page {next_page_num}[/yellow]")
+            lower_last_page(state, next_page_num - 1)
+            await write_ready_pages(state, exporter)
+            return
+        
+        if not await navigate_to_next_page(page, next_page_num):
+            # The pages may well exist; report them as not scraped rather than ending the results here
+            console.print(f"[yellow]⚠️ Could not reach page {next_page_num}, giving up on pages from {target_page} for this worker[/yellow]")
+            give_up_pages(state, target_page, stride)
+            await write_ready_pages(state, exporter)
+            return
+        page_num = next_page_num
 
-async def process_search_results(page: Page, exporter: 'SlackSearchExport'):
-    """Process all pages of search results."""
-    page_num = 1
-    total_messages = 0
+async def process_search_results(browser, context, page: Page, workspace_url: str, query: str, exporter: 'SlackSearchExport', workers: int = 1, live_progress: bool = True, debug: bool = False, verbose: bool = False):
+    """Process all pages of search results, with `workers` browser contexts sharing the pages."""
     start_time = time.time()
+    # Slack stops at 100 pages of results
+    last_page = 100
     
     try:
-        while True:
-            console.print(f"\n[cyan]📄 Processing page {page_num}...[/cyan]")
-            
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[cyan]📥 Processing messages..."),
-                BarColumn(complete_style="cyan", finished_style="green"),
-                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                TextColumn("({task.completed}/{task.total} messages)"),
-                console=console
-            ) as progress:
-                task = progress.add_task("", total=20)  # Expected messages per page
-                
-                messages_found = await scroll_for_messages(page, exporter, progress, task)
-                progress.update(task, completed=messages_found)
-                total_messages += messages_found
-                
-                # Pass the next page number to the navigation function
-                if messages_found == 0 or not await navigate_to_next_page(page, page_num + 1):
-                    break
-                
-                page_num += 1
+        # Slack shows 20 results per page; knowing how many pages there are lets us tell missing pages
+        # from the end of the results, and not start more workers than there are pages
+        total_results = await get_total_results_count(page)
+        if total_results:
+            last_page = min(math.ceil(total_results / 20), last_page)
+        if workers > 1:
+            workers = min(workers, last_page)
+            console.print(f"\n[cyan]📄 Processing up to {last_page} pages with {workers} workers...[/cyan]")
+        
+        # One progress display for the whole run, with a task per page (only shown when alone on the console)
+        live_progress = live_progress and workers == 1
+        progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[cyan]📥 Processing messages..."),
+            BarColumn(complete_style="cyan", finished_style="green"),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            TextColumn("({task.completed}/{task.total} messages)"),
+            console=console,
+            disable=not live_progress
+        )
+        state = {
+            'query': query,
+            'last_page': last_page,
+            'next_page': 1,
+            'pages': {},
+            'total_messages': 0,
+            'pages_written': 0,
+            'scraped': set(),  # Pages scraped by any worker
+            'failed': set(),  # Pages a worker had to give up on
+            'live_progress': live_progress,
+            'progress': progress,
+            'debug': debug,
+            'verbose': verbose
+        }
+        storage_state = await context.storage_state() if workers > 1 and browser else None
+        
+        async def worker(first_page: int):
+            # The first worker reuses the page that already shows the results
+            if first_page == 1:
+                await scrape_page_stride(page, 1, workers, state, exporter)
+                return
             
-        elapsed_time = time.time() - start_time
-        console.print(Panel.fit(
-            f"[green]📬 Search Complete![/green]\n"
-            f"[cyan]📊 Statistics:[/cyan]\n"
-            f"   • Pages processed: {page_num}\n"
-            f"   • Messages found: {total_messages}\n"
-            f"   • Time taken: {elapsed_time:.1f} seconds\n"
-            f"   • Messages per second: {total_messages/elapsed_time:.1f}\n"
-            f"[blue]📁 Output saved to: {exporter.filename}[/blue]",
-            title="🐧 Summary",
-            border_style="cyan"
-        ))
+            try:
+                worker_owner, worker_page = await open_search_page(browser, storage_state, workspace_url, query, None if browser else context)
+                problem = "could not run the search"
+            except Exception as e:
+                # E.g. a navigation timeout: give up this worker's pages, not the whole run
+                worker_page = None
+                problem = f"could not open the results: {str(e)}"
+            if not worker_page:
+                console.print(f"[yellow]⚠️ Worker for page {first_page} {problem}[/yellow]")
+                give_up_pages(state, first_page, workers)
+                await write_ready_pages(state, exporter)
+                return
+            try:
+                await scrape_page_stride(worker_page, first_page, workers, state, exporter)
+            finally:
+                await worker_owner.close()
+        
+        with progress:
+            await asyncio.gather(*(worker(i) for i in range(1, workers + 1)))
+        
+        missing_pages = [page_num for page_num in state['failed'] if page_num <= state['last_page']]
+        print_summary(state['pages_written'], state['total_messages'], start_time, exporter, missing_pages)
         
     except KeyboardInterrupt:
         console.print("\n[yellow]🛑 Gracefully stopping...[/yellow]")
         raise
     except Exception as e:
-        if args.verbose:
+        if verbose:
             console.print(f"\n[blue]❌ Error: {e}[/blue]")
         raise
 
+def query_output_file(output_file, index: int):
+    """Output file for the index-th of several queries, numbered so they don't collide."""
+    if output_file is None:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return f'slack_export_{timestamp}_{index}.txt'
+    root, ext = os.path.splitext(output_file)
+    return f'{root}_{index}{ext}'
+
+# Queued to SlackSearchExport in place of a message to checkpoint the file
+_FLUSH = object()
+
 class SlackSearchExport:
     """Class to handle exporting Slack search results."""
-    def __init__(self, output_file=None, output_format='text'):
+    def __init__(self, output_file=None, output_format='text', verbose=False):
         self.output_format = output_format
+        self.verbose = verbose
         self.total_messages = 0
         
+        # Last formatted second, reused when consecutive messages share it
+        self._last_ts_int = -1
+        self._last_ts_str = ''
+        
         # Generate default filename if none provided
         if output_file is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -644,78 +904,236 @@ class SlackSearchExport:
         else:
             self.filename = output_file
             
-        self.file = open(self.filename, 'w', encoding='utf-8')
+        # Opened by the writer task, so creating an exporter doesn't wait on the disk
+        self.file = None
+        
+        # Make sure buffered messages reach the disk even if we never get to close() ourselves
+        atexit.register(self.close)
         
-        # Initialize JSON array if using JSON format
+        # Scraping only queues messages; a writer task formats them and does the disk I/O
+        self.queue = asyncio.Queue(maxsize=1000)
+        self._opened = asyncio.get_running_loop().create_future()
+        self.writer_task = asyncio.create_task(self._writer_loop())
+    
+    async def ready(self):
+        """Wait until the output file is open; raises the error if it couldn't be opened."""
+        await asyncio.shield(self._opened)
+    
+    def _open(self):
+        """Open the output file and start the JSON array if using JSON format."""
+        # Large write buffer; messages are flushed once per results page rather than one by one
+        self.file = open(self.filename, 'wb', buffering=1 << 20)
         if self.output_format == 'json':
-            self.file.write('[\n')
+            self.file.write(b'[\n')
             
     def write_message(self, message):
         """Write a single message to the output file."""
         try:
-            if self.output_format == 'json':
-                # Add comma if not first message
-                if self.total_messages > 0:
-                    self.file.write(',\n')
-                json.dump(message, self.file, indent=2)
+            if self.output_format in ('json', 'ndjson'):
+                # One compact record per line; inside a JSON array they are also comma-separated
+                record = orjson.dumps(message) if orjson else json.dumps(message).encode('utf-8')
+                if self.output_format == 'ndjson':
+                    output = record + b'\n'
+                else:
+                    output = b',\n' + record if self.total_messages > 0 else record
             else:
                 # Text format: timestamp, sender, channel, text
-                timestamp_str = datetime.fromtimestamp(message['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+                ts_int = int(message['timestamp'])
+                if ts_int != self._last_ts_int:
+                    self._last_ts_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts_int))
+                    self._last_ts_int = ts_int
+                timestamp_str = self._last_ts_str
                 channel = message.get('channel', 'unknown-channel')
-                self.file.write(f"[{timestamp_str}] {message['sender']} in #{channel}:\n{message['text']}\n\n")
+                output = f"[{timestamp_str}] {message['sender']} in #{channel}:\n{message['text']}\n\n".encode('utf-8')
             
+            self.file.write(output)
             self.total_messages += 1
-            self.file.flush()  # Ensure message is written immediately
             
         except Exception as e:
-            if args.verbose:
+            if self.verbose:
                 console.print(f"[blue]❌ Error writing message: {e}[/blue]")
+    
+    async def put(self, message):
+        """Queue a message for the writer task (waits only if the writer falls far behind)."""
+        await self.queue.put(message)
+    
+    async def flush(self):
+        """Queue a flush behind the messages already queued (called once a page is written)."""
+        await self.queue.put(_FLUSH)
+    
+    async def _writer_loop(self):
+        """Write queued messages in batches until the None sentinel arrives."""
+        # Open the file in a thread while the browser starts up; ready() reports how that went
+        try:
+            await asyncio.to_thread(self._open)
+        except Exception as e:
+            self._opened.set_exception(e)
+            return
+        self._opened.set_result(None)
+        
+        while True:
+            # Take everything that is waiting, then format and write it in a thread so a slow
+            # disk (or the buffer spilling over) never blocks the event loop
+            items = [await self.queue.get()]
+            while not self.queue.empty():
+                items.append(self.queue.get_nowait())
+            stop = any(item is None for item in items)
+            try:
+                await asyncio.to_thread(self._write_items, [item for item in items if item is not None])
+            except Exception as e:
+                if self.verbose:
+                    console.print(f"[blue]❌ Error writing output: {e}[/blue]")
+            if stop:
+                return
+    
+    def _write_items(self, items):
+        """Write a batch of queued messages; flush markers checkpoint the file at page boundaries."""
+        for item in items:
+            if item is _FLUSH:
+                # Checkpoint every page so an interrupted run still leaves most messages on disk
+                self.file.flush()
+            else:
+                self.write_message(item)
+    
+    async def aclose(self):
+        """Write everything still queued, then finalize the file."""
+        if not self.writer_task.done():
+            await self.queue.put(None)
+            await self.writer_task
+        # The final flush can take a while for a big file; keep it off the event loop
+        await asyncio.to_thread(self.close)
             
     def close(self):
         """Finalize the file (especially important for JSON format)."""
-        if self.output_format == 'json' and self.total_messages > 0:
-            self.file.write('\n]')  # Close the JSON array
+        if self.file is None or self.file.closed:
+            return
+        atexit.unregister(self.close)
+        
+        if self.output_format == 'json':
+            self.file.write(b'\n]' if self.total_messages > 0 else b']')  # Close the JSON array
         self.file.flush()
         self.file.close()
 
-async def main():
+def parse_cli():
+    """Parse the command line."""
     parser = argparse.ArgumentParser(description="🐧 Penguin - Slack Search Scraper - Export your Slack search results")
-    parser.add_argument('query', help='Search query to use')
+    parser.add_argument('query', nargs='+', help='Search query to use (several queries are searched side by side, each into its own file)')
     parser.add_argument('--workspace', help='Slack workspace URL', default='https://app.slack.com/client')
-    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format')
+    parser.add_argument('--format', choices=['text', 'json', 'ndjson'], default='text', help='Output format (ndjson writes one JSON object per line)')
     parser.add_argument('--output', help='Output file (default: slack_export_[timestamp].txt)')
     parser.add_argument('--auth-file', default='slack_auth.json', help='Path to save/load authentication')
+    parser.add_argument('--force-login', action='store_true', help='Ignore the saved authentication and log in again')
+    parser.add_argument('--user-data-dir', help='Keep a persistent browser profile here (e.g. ~/.cache/penguin/chromium) so repeat runs start with a warm cache and session')
+    parser.add_argument('--cdp-endpoint', help='Connect to an already running Chromium (e.g. http://localhost:9222) instead of launching one')
+    parser.add_argument('--headless', action='store_true', help='Run the browser without a window (needs a saved auth file, since logging in is interactive)')
+    parser.add_argument('--parallel', type=int, default=1, help='Number of browser contexts scraping result pages at the same time (default: 1)')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose debug output')
-    
-    global args
+    parser.add_argument('--debug', action='store_true', default=bool(os.environ.get('SLACK_SCRAPER_DEBUG')),
+                        help='Dump the DOM structure of the results page (also enabled by SLACK_SCRAPER_DEBUG)')
     args = parser.parse_args()
-    
-    console.print(Panel.fit(PENGUIN_BANNER, border_style="cyan"))
-    
+    if args.parallel < 1:
+        parser.error('--parallel must be at least 1')
+    return args
+
+async def run(args):
+    """Log in, run the searches and export the results."""
+    from playwright.async_api import async_playwright, Error as PwError
     browser = None
     context = None
     page = None
-    exporter = None
+    exporters = []
+    
+    if args.force_login:
+        try:
+            os.remove(args.auth_file)
+        except FileNotFoundError:
+            pass
     
     try:
+        start_html_pool(args.parallel)
+        # The exporters open their files in a thread while the browser starts up
+        if len(args.query) == 1:
+            exporters.append(SlackSearchExport(args.output, args.format, args.verbose))
+        else:
+            exporters.extend(SlackSearchExport(query_output_file(args.output, index), args.format, args.verbose)
+                             for index in range(1, len(args.query) + 1))
+        
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
-            context = await browser.new_context(storage_state=args.auth_file if os.path.exists(args.auth_file) else None)
-            page = await context.new_page()
+            if args.cdp_endpoint:
+                # Reuse a running browser; we only add (and later remove) our own context
+                browser = await p.chromium.connect_over_cdp(args.cdp_endpoint)
+                context = await new_scraper_context(browser, load_auth_state(args.auth_file))
+            elif args.user_data_dir:
+                # Keep cookies and the HTTP cache in a profile on disk so repeat runs start warm;
+                # no request routing here, since that would bypass the cache
+                chromium_args = (HEADLESS_CHROMIUM_ARGS if args.headless else []) + [NO_IMAGES_CHROMIUM_ARG]
+                context = await prepare_scraper_context(await p.chromium.launch_persistent_context(
+                    os.path.expanduser(args.user_data_dir),
+                    headless=args.headless,
+                    args=chromium_args
+                ), block_resources=False)
+                # A fresh profile has no Slack session yet; start it from the saved login when there is one
+                auth_state = load_auth_state(args.auth_file)
+                if auth_state and not await context.cookies(args.workspace):
+                    await context.add_cookies(auth_state.get('cookies', []))
+            else:
+                browser = await p.chromium.launch(
+                    headless=args.headless,
+                    args=HEADLESS_CHROMIUM_ARGS if args.headless else None
+                )
+                context = await new_scraper_context(browser, load_auth_state(args.auth_file))
+            if args.force_login:
+                await context.clear_cookies()  # A persistent profile or running browser may still be logged in
+            # A persistent context already comes with a blank page
+            page = context.pages[0] if context.pages else await context.new_page()
             
-            exporter = SlackSearchExport(args.output, args.format)
+            # Don't log in and scrape everything only to find the output can't be written
+            for exporter in exporters:
+                try:
+                    await exporter.ready()
+                except OSError as e:
+                    console.print(f"[red]❌ Could not open {exporter.filename}: {str(e)}[/red]")
+                    sys.exit(1)
             
             if not await login_to_slack(page, args.workspace, args.auth_file):
                 console.print("[red]❌ Failed to log in to Slack[/red]")
                 return
             
-            console.print(f"[cyan]🔍 Searching for: {args.query}[/cyan]")
-            
-            if not await navigate_to_search(page, args.query):
-                console.print("[red]❌ Failed to perform search[/red]")
-                return
-            
-            await process_search_results(page, exporter)
+            if len(args.query) == 1:
+                query = args.query[0]
+                console.print(f"[cyan]🔍 Searching for: {query}[/cyan]")
+                
+                if not await navigate_to_search(page, query):
+                    console.print("[red]❌ Failed to perform search[/red]")
+                    return
+                
+                await process_search_results(browser, context, page, args.workspace, query, exporters[0], args.parallel, debug=args.debug, verbose=args.verbose)
+            else:
+                # Each query gets its own context (sharing the login) and output file
+                storage_state = await context.storage_state() if browser else None
+                semaphore = asyncio.Semaphore(MAX_PARALLEL_QUERIES)
+                
+                async def run_query(query: str, exporter: 'SlackSearchExport'):
+                    async with semaphore:
+                        console.print(f"[cyan]🔍 Searching for: {query} -> {exporter.filename}[/cyan]")
+                        
+                        # One query going wrong must not take the other queries (or the browser) down with it
+                        try:
+                            query_owner, query_page = await open_search_page(browser, storage_state, args.workspace, query, None if browser else context)
+                        except Exception as e:
+                            console.print(f"[red]❌ Failed to perform search: {query} ({str(e)})[/red]")
+                            return
+                        if not query_page:
+                            console.print(f"[red]❌ Failed to perform search: {query}[/red]")
+                            return
+                        try:
+                            await process_search_results(browser, query_page.context, query_page, args.workspace, query, exporter, args.parallel, live_progress=False, debug=args.debug, verbose=args.verbose)
+                        except Exception as e:
+                            console.print(f"[red]❌ Search failed: {query} ({str(e)})[/red]")
+                        finally:
+                            await query_owner.close()
+                
+                await asyncio.gather(*(run_query(query, exporter) for query, exporter in zip(args.query, exporters)))
             
     except KeyboardInterrupt:
         console.print("\n[yellow]🛑 Gracefully shutting down...[/yellow]")
@@ -723,38 +1141,43 @@ async def main():
         if args.verbose:
             console.print(f"\n[blue]❌ Error: {e}[/blue]")
     finally:
-        if exporter:
+        for exporter in exporters:
             try:
-                exporter.close()
+                await exporter.aclose()
             except Exception as e:
                 if args.verbose:
                     console.print(f"[blue]⚠️  Warning: Could not close exporter: {str(e)}[/blue]")
         
-        # Close browser resources in reverse order
-        try:
-            if page:
-                await page.close()
-        except Exception:
-            pass
-            
-        try:
-            if context:
-                await context.close()
-        except Exception:
-            pass
-            
-        try:
-            if browser:
-                await browser.close()
-        except Exception:
-            pass
+        # Close browser resources together
+        closers = [resource for resource in (page, context, browser) if resource]
+        results = await asyncio.gather(*(resource.close() for resource in closers), return_exceptions=True)
+        for result in results:
+            # Playwright errors only mean it was already closed (or the browser went away first)
+            if isinstance(result, Exception) and not isinstance(result, PwError) and args.verbose:
+                console.print(f"[blue]⚠️  Warning: Could not close browser resource: {str(result)}[/blue]")
 
 if __name__ == '__main__':
+    # Parse arguments and draw the banner before the event loop and browser start up
+    args = parse_cli()
+    verbose = args.verbose
+    console.print(Panel.fit(PENGUIN_BANNER, border_style="cyan"))
     try:
-        asyncio.run(main())
+        if hasattr(asyncio, 'Runner'):
+            # Python 3.11+: one runner owns the event loop (uvloop's, when installed) for the session
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+                runner.run(run(args))
+        else:
+            if uvloop:
+                uvloop.install()
+            asyncio.run(run(args))
     except KeyboardInterrupt:
         console.print("\n[yellow]👋 Goodbye! Thanks for using Penguin![/yellow]")
+    except ImportError as e:
+        # Nothing was scraped yet; say what's missing instead of the reassurance below
+        console.print(f"[red]❌ Missing dependency: {str(e)}[/red]")
+        console.print("[yellow]Install the dependencies with `poetry install` (and `poetry run playwright install`)[/yellow]")
+        sys.exit(1)
     except Exception as e:
-        if args.verbose:
+        if verbose:
             console.print(f"\n[blue]❌ Fatal error: {str(e)}[/blue]")
         console.print("[yellow]Don't worry - your messages were saved! 📝[/yellow]")